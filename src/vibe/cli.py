@@ -1,11 +1,22 @@
-import json, os, re, shutil, subprocess, time
+import codecs, hashlib, json, os, re, shlex, shutil, stat, subprocess, sys, threading, time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from urllib.parse import urlparse
 from pathlib import Path
 from typing import Optional
 import typer, yaml
 from rich import print
 from rich.table import Table
-from textwrap import dedent
+
+try:  # optional C JSON codec for the registry
+    import orjson
+except ImportError:
+    orjson = None
+
+try:  # libyaml-backed loader when PyYAML was built with it
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
 
 app = typer.Typer(add_completion=False, help="Deploy vibe-coded apps to the Hub")
 
@@ -13,18 +24,91 @@ VIBES_ROOT = Path(os.environ.get("VIBES_ROOT", "/srv/vibes")).resolve()
 STATIC_ROOT = VIBES_ROOT / "static"
 APPS_ROOT = VIBES_ROOT / "apps"
 REGISTRY_PATH = VIBES_ROOT / "registry" / "apps.json"
+STATIC_IGNORE = frozenset({".git", ".github", "node_modules", ".DS_Store", "vibe.yaml"})
+# dir-fd relative copies with in-kernel byte transfer; elsewhere shutil.copytree
+_FD_COPY = sys.platform.startswith("linux") and os.scandir in os.supports_fd
+# cleared after the first copy_file_range failure (e.g. static/ on another filesystem)
+_COPY_FILE_RANGE = hasattr(os, "copy_file_range")
+
+_EXPOSE_RE = re.compile(r"\s*EXPOSE\s+(\d+)", re.IGNORECASE)  # per line, via .match
+# KEY=value lines of a .env file; blanks and #comments never match
+_ENV_LINE_RE = re.compile(r"(?m)^[ \t]*([A-Za-z_][A-Za-z0-9_]*)[ \t]*=(.*)$")
+# matches: --port 8000, --port=8000, -p 3000
+_PORT_RE = re.compile(r"(?:--port(?:\s+|=)|-p\s+)(\d+)")
+
+_TRAEFIK_ENABLE = sys.intern("traefik.enable=true")
+
+# generated Dockerfiles for server apps without their own
+_NODE_DOCKERFILE = """\
+FROM node:20-alpine
+WORKDIR /app
+COPY package*.json ./
+{install_line}
+COPY . .
+ENV PORT={port}
+EXPOSE {port}
+CMD ["sh","-lc","{start_cmd}"]
+"""
+_PYTHON_DOCKERFILE = """\
+FROM python:3.11-slim
+WORKDIR /app
+COPY requirements*.txt ./
+{install_line}
+COPY . .
+ENV PORT={port}
+EXPOSE {port}
+CMD ["sh","-lc","{start_cmd}"]
+"""
+
+# docker-compose.yml for server apps; every scalar is filled in via _yaml_quote
+_COMPOSE_TMPL = """\
+version: '3.9'
+services:
+  app:
+    build:
+      context: {context}
+      dockerfile: {dockerfile}
+    image: {image}
+    restart: unless-stopped
+    networks:
+    - vibes_net
+    labels:
+{labels}    environment:
+{environment}{env_file}networks:
+  vibes_net:
+    external: true
+"""
+
+_ROOTS_READY = False  # set by _ensure_roots()
+
+# Docker SDK client; None until first use, False when the SDK/daemon is unavailable
+_DOCKER_CLIENT = None
+
+# (stat key, raw bytes) of the last apps.json read or written
+_REG_CACHE: Optional[tuple[tuple, bytes]] = None
+
+class _SlugTable(dict):
+    # str.translate leaves chars missing from the table untouched, so map
+    # anything outside the 0-255 range to a dash as well.
+    def __missing__(self, c: int) -> str:
+        return "-"
+
+_SLUG_TABLE = _SlugTable({c: "-" for c in range(256)})
+for _c in "abcdefghijklmnopqrstuvwxyz0123456789-":
+    _SLUG_TABLE[ord(_c)] = _c
+del _c
+
+@lru_cache(maxsize=32)
+def _parse_env_cached(path: str, mtime_ns: int) -> dict:
+    with open(path) as f:
+        return {k: v.strip() for k, v in _ENV_LINE_RE.findall(f.read())}
 
 def _parse_dotenv(path: Path) -> dict:
-    if not path.exists():
+    try:
+        st = path.stat()
+    except FileNotFoundError:
         return {}
-    env = {}
-    for line in path.read_text().splitlines():
-        line = line.strip()
-        if not line or line.startswith("#") or "=" not in line:
-            continue
-        k, v = line.split("=", 1)
-        env[k.strip()] = v.strip()
-    return env
+    return dict(_parse_env_cached(str(path), st.st_mtime_ns))
 
 def detect_base_url() -> str:
     """
@@ -59,22 +143,22 @@ def ensure_trailing(s: str) -> str:
     return s if s.endswith("/") else s + "/"
 
 def infer_port_from_dockerfile(path: Path) -> int | None:
+    # stream line by line and stop at the first EXPOSE
     try:
-        txt = path.read_text()
+        with path.open() as f:
+            for line in f:
+                m = _EXPOSE_RE.match(line)
+                if m:
+                    return int(m.group(1))
     except Exception:
         return None
-    m = re.search(r"^\s*EXPOSE\s+(\d+)", txt, re.MULTILINE | re.IGNORECASE)
-    return int(m.group(1)) if m else None
+    return None
 
 def infer_port_from_start(start: str) -> int | None:
     if not start:
         return None
-    # matches: --port 8000, --port=8000, -p 3000
-    for pat in [r"--port\s+(\d+)", r"--port=(\d+)", r"-p\s+(\d+)"]:
-        m = re.search(pat, start)
-        if m:
-            return int(m.group(1))
-    return None
+    m = _PORT_RE.search(start)
+    return int(m.group(1)) if m else None
 
 def default_port_for_runtime(runtime: str) -> int:
     runtime = (runtime or "").lower()
@@ -82,14 +166,13 @@ def default_port_for_runtime(runtime: str) -> int:
         return 8000
     return 3000  # node or other
 
-def make_traefik_labels(app_id: str, internal_port: int | None, base_url: str | None = None) -> list[str]:
+def make_traefik_labels(app_id: str, internal_port: int | None, base_url: str | None = None) -> tuple[str, ...]:
     """
-    Create two routers:
+    Create two routers (app_id must already be slugified):
       - HTTP (no Host) so it works by IP immediately
       - HTTPS (Host=DOMAIN) only if a domain was configured in base_url
     """
-    sid = slugify(app_id)
-    rid = sid.replace("-", "_")
+    rid = app_id.replace("-", "_")
     host = None
     if base_url:
         try:
@@ -97,78 +180,69 @@ def make_traefik_labels(app_id: str, internal_port: int | None, base_url: str |
         except Exception:
             host = None
 
-    labels = [
-        "traefik.enable=true",
+    # shared prefixes, built once per call (interned, so repeat calls for an app reuse them)
+    router = sys.intern(f"traefik.http.routers.{rid}")
+    strip = sys.intern(f"{rid}-strip")
+    labels = (
+        _TRAEFIK_ENABLE,
         # common middleware: strip /app/<id>
-        f"traefik.http.middlewares.{rid}-strip.stripprefix.prefixes=/app/{sid}",
-    ]
-
-    # HTTP router (catch-all by any Host, works via IP)
-    labels += [
-        f"traefik.http.routers.{rid}-http.rule=PathPrefix(`/app/{sid}`)",
-        f"traefik.http.routers.{rid}-http.entrypoints=web",
-        f"traefik.http.routers.{rid}-http.priority=100",
-        f"traefik.http.routers.{rid}-http.middlewares={rid}-strip",
-    ]
+        f"traefik.http.middlewares.{strip}.stripprefix.prefixes=/app/{app_id}",
+        # HTTP router (catch-all by any Host, works via IP)
+        f"{router}-http.rule=PathPrefix(`/app/{app_id}`)",
+        f"{router}-http.entrypoints=web",
+        f"{router}-http.priority=100",
+        f"{router}-http.middlewares={strip}",
+    )
 
     # HTTPS router (only if we have a domain)
     if host:
-        labels += [
-            f"traefik.http.routers.{rid}-https.rule=Host(`{host}`) && PathPrefix(`/app/{sid}`)",
-            f"traefik.http.routers.{rid}-https.entrypoints=websecure",
-            f"traefik.http.routers.{rid}-https.tls=true",
-            f"traefik.http.routers.{rid}-https.tls.certresolver=le",
-            f"traefik.http.routers.{rid}-https.priority=100",
-            f"traefik.http.routers.{rid}-https.middlewares={rid}-strip",
-        ]
+        labels += (
+            f"{router}-https.rule=Host(`{host}`) && PathPrefix(`/app/{app_id}`)",
+            f"{router}-https.entrypoints=websecure",
+            f"{router}-https.tls=true",
+            f"{router}-https.tls.certresolver=le",
+            f"{router}-https.priority=100",
+            f"{router}-https.middlewares={strip}",
+        )
 
     # Service port (if known). If omitted, Traefik falls back to EXPOSE.
     if internal_port:
-        labels.append(f"traefik.http.services.{rid}.loadbalancer.server.port={internal_port}")
+        labels += (f"traefik.http.services.{rid}.loadbalancer.server.port={internal_port}",)
 
     return labels
 
 def generate_dockerfile(repo_dir: Path, app_id: str, server_cfg: dict) -> tuple[Path, int]:
+    # app_id is already slugified (write_compose passes its sid)
     runtime = (server_cfg.get("runtime") or "").lower()
     install = server_cfg.get("install")
     start   = server_cfg.get("start") or ""
     # try to infer from start, else fallback by runtime
     port = infer_port_from_start(start) or default_port_for_runtime(runtime)
 
-    ddir = APPS_ROOT / slugify(app_id) / ".deploy"
+    ddir = APPS_ROOT / app_id / ".deploy"
     ddir.mkdir(parents=True, exist_ok=True)
     out = ddir / "Dockerfile.generated"
 
     if runtime == "node":
-        content = f"""
-        FROM node:20-alpine
-        WORKDIR /app
-        COPY package*.json ./
-        {'RUN ' + install if install else 'RUN npm ci --omit=dev'}
-        COPY . .
-        ENV PORT={port}
-        EXPOSE {port}
-        CMD ["sh","-lc","{start or 'npm start'}"]
-        """
+        template = _NODE_DOCKERFILE
+        install_line = "RUN " + install if install else "RUN npm ci --omit=dev"
+        start_cmd = start or "npm start"
     elif runtime == "python":
-        content = f"""
-        FROM python:3.11-slim
-        WORKDIR /app
-        COPY requirements*.txt ./
-        {'RUN ' + install if install else 'RUN pip install --no-cache-dir -r requirements.txt || true'}
-        COPY . .
-        ENV PORT={port}
-        EXPOSE {port}
-        CMD ["sh","-lc","{start or f'uvicorn app:app --host 0.0.0.0 --port {port}'}"]
-        """
+        template = _PYTHON_DOCKERFILE
+        install_line = "RUN " + install if install else "RUN pip install --no-cache-dir -r requirements.txt || true"
+        start_cmd = start or f"uvicorn app:app --host 0.0.0.0 --port {port}"
     else:
         raise RuntimeError("runtime must be 'node' or 'python' (or provide server.dockerfile)")
 
-    out.write_text(dedent(content).strip() + "\n")
+    out.write_text(template.format_map({"install_line": install_line, "port": port, "start_cmd": start_cmd}))
     return out, port
 
+def _yaml_quote(s: str) -> str:
+    """Double-quoted YAML scalar; JSON string syntax is a subset of YAML's."""
+    return json.dumps(s, ensure_ascii=False)
+
 def write_compose(app_id: str, repo_dir: Path, server_cfg: dict) -> Path:
-    sid = slugify(app_id)
+    sid = app_id  # callers pass the final slug
     ddir = APPS_ROOT / sid / ".deploy"
     ddir.mkdir(parents=True, exist_ok=True)
 
@@ -194,33 +268,23 @@ def write_compose(app_id: str, repo_dir: Path, server_cfg: dict) -> Path:
 
     # 2) Build environment (PORT, plus any pass-through names)
     env_names = server_cfg.get("env") or []
-    env_map = {"PORT": str(internal_port)}
-    for name in env_names:
-        if name in os.environ:
-            env_map[name] = os.environ[name]
+    environ = os.environ
+    env_map = {"PORT": str(internal_port), **{n: environ[n] for n in env_names if n in environ}}
 
-    # 3) Compose object
+    # 3) Compose file (fixed schema, so fill a template instead of walking a dict through the emitter)
     labels = make_traefik_labels(sid, internal_port)
-    compose_yaml = {
-        "version": "3.9",
-        "services": {
-            "app": {
-                "build": { "context": str(repo_dir), "dockerfile": str(df_path) },
-                "image": f"vibe-{sid}:latest",
-                "restart": "unless-stopped",
-                "networks": ["vibes_net"],
-                "labels": labels,
-                "environment": env_map,
-            }
-        },
-        "networks": {"vibes_net": {"external": True}},
-    }
     env_file = server_cfg.get("env_file")
-    if env_file:
-        compose_yaml["services"]["app"]["env_file"] = [env_file]
+    compose_text = _COMPOSE_TMPL.format(
+        context=_yaml_quote(str(repo_dir)),
+        dockerfile=_yaml_quote(str(df_path)),
+        image=_yaml_quote(f"vibe-{sid}:latest"),
+        labels="".join(f"    - {_yaml_quote(l)}\n" for l in labels),
+        environment="".join(f"      {_yaml_quote(k)}: {_yaml_quote(v)}\n" for k, v in env_map.items()),
+        env_file=f"    env_file:\n    - {_yaml_quote(str(env_file))}\n" if env_file else "",
+    )
 
     yml_path = ddir / "docker-compose.yml"
-    yml_path.write_text(yaml.safe_dump(compose_yaml, sort_keys=False))
+    yml_path.write_text(compose_text)
     return yml_path
 
 
@@ -241,13 +305,47 @@ def compose_down_if_present(app_id: str) -> bool:
     """Stop a dynamic app if a compose file exists (future-proof)."""
     deploy_dir = APPS_ROOT / app_id / ".deploy"
     yml = deploy_dir / "docker-compose.yml"
-    if yml.exists():
+    if os.path.isfile(yml):
         print(f"[cyan]Bringing down compose stack[/] in {deploy_dir}")
         run(["docker", "compose", "-f", str(yml), "down", "--remove-orphans", "-v"])
         return True
     return False
 
+def _docker_client():
+    """Shared Docker SDK client (optional `docker` package), or None to use the CLI."""
+    global _DOCKER_CLIENT
+    if _DOCKER_CLIENT is None:
+        try:
+            import docker
+            _DOCKER_CLIENT = docker.from_env()
+        except Exception:
+            _DOCKER_CLIENT = False
+    return _DOCKER_CLIENT or None
+
 def docker_run(image: str, workdir: Path, commands: str, env: dict):
+    client = _docker_client()
+    if client is not None:
+        # talk to the daemon directly: no docker CLI process per build
+        print(f"[bold cyan]$[/] docker run (sdk) {image} sh -lc {shlex.quote(commands)}")
+        container = client.containers.run(
+            image, ["sh", "-lc", commands],
+            volumes={str(workdir): {"bind": "/src", "mode": "rw"}},
+            working_dir="/src", environment=env, detach=True,
+        )
+        try:
+            # incremental: a multibyte character split across chunks still decodes whole
+            decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+            for chunk in container.logs(stream=True, follow=True):
+                sys.stdout.write(decoder.decode(chunk))
+            sys.stdout.write(decoder.decode(b"", final=True))
+            sys.stdout.flush()
+            code = container.wait()["StatusCode"]
+        finally:
+            container.remove(force=True)
+        if code:
+            raise subprocess.CalledProcessError(code, ["docker", "run", image, "sh", "-lc", commands])
+        return
+
     cmd = ["docker","run","--rm","-v",f"{workdir}:/src","-w","/src"]
     for k,v in env.items():
         cmd += ["-e", f"{k}={v}"]
@@ -255,24 +353,92 @@ def docker_run(image: str, workdir: Path, commands: str, env: dict):
     run(cmd) 
 
 def run(cmd, cwd: Optional[Path] = None, env: Optional[dict] = None):
-    print(f"[bold cyan]$[/] {' '.join(cmd)}")
-    subprocess.run(cmd, cwd=str(cwd) if cwd else None, env=env, check=True)
+    print(f"[bold cyan]$[/] {shlex.join(cmd)}")
+    # subprocess accepts a Path cwd as-is; env=None inherits os.environ without a copy.
+    # close_fds=False is safe (Python fds are non-inheritable, PEP 446) and skips
+    # the child's close-fds sweep before exec.
+    subprocess.run(cmd, cwd=cwd, env=None if env is os.environ else env, close_fds=False, check=True)
+
+def git_head(repo_dir: Path) -> str | None:
+    try:
+        return subprocess.check_output(["git", "-C", str(repo_dir), "rev-parse", "HEAD"], text=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def git_remote_head(repo_url: str) -> str | None:
+    try:
+        out = subprocess.check_output(["git", "ls-remote", repo_url, "HEAD"], text=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return (out.split() or [None])[0]
 
+@lru_cache(maxsize=256)
 def slugify(s: str) -> str:
-    s = s.strip().lower()
-    s = re.sub(r"[^a-z0-9\-]+", "-", s)
-    s = re.sub(r"-{2,}", "-", s).strip("-")
-    return s or "app"
+    # whitespace maps to "-" like any other separator, and the split/join drops
+    # empty runs, so this also collapses dashes and trims both ends (no strip pass)
+    return "-".join([p for p in s.lower().translate(_SLUG_TABLE).split("-") if p]) or "app"
+
+def _registry_key(st: os.stat_result) -> tuple:
+    # validates the cached bytes; saves replace the file, so a new inode flags
+    # rewrites even on coarse-mtime filesystems
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+def _ensure_roots():
+    """Create the VIBES_ROOT layout once per process."""
+    global _ROOTS_READY
+    if _ROOTS_READY:
+        return
+    for p in (VIBES_ROOT, STATIC_ROOT, APPS_ROOT, REGISTRY_PATH.parent):
+        p.mkdir(parents=True, exist_ok=True)
+    _ROOTS_READY = True
 
 def load_registry() -> dict:
-    if REGISTRY_PATH.exists():
-        return json.loads(REGISTRY_PATH.read_text())
-    return {"apps": {}}
+    global _REG_CACHE
+    try:
+        key = _registry_key(REGISTRY_PATH.stat())
+    except FileNotFoundError:
+        return {"apps": {}}
+    if _REG_CACHE is None or _REG_CACHE[0] != key:
+        with open(REGISTRY_PATH, "rb") as f:
+            # re-key off the handle actually read: a save may have replaced the file since stat()
+            _REG_CACHE = (_registry_key(os.fstat(f.fileno())), f.read())
+    # callers mutate the result before saving, so hand out a fresh parse each time
+    # (re-parsing the cached bytes beats deep-copying a parsed tree)
+    raw = _REG_CACHE[1]
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
 
 def save_registry(reg: dict):
-    REGISTRY_PATH.parent.mkdir(parents=True, exist_ok=True)
-    REGISTRY_PATH.write_text(json.dumps(reg, indent=2))
-    print(f"[green]Updated registry[/] → {REGISTRY_PATH}")
+    global _REG_CACHE
+    _ensure_roots()
+    # sorted keys keep the file byte-stable across runs and encoders
+    if orjson is not None:
+        data = orjson.dumps(reg, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS)
+    else:
+        data = json.dumps(reg, indent=2, ensure_ascii=False, sort_keys=True).encode("utf-8")
+    # no-op saves skip the write (a plain bytes compare bails on the first difference)
+    try:
+        key = _registry_key(REGISTRY_PATH.stat())
+    except FileNotFoundError:
+        unchanged = False
+    else:
+        # the cached bytes stand in for the file while its stat key still matches
+        on_disk = _REG_CACHE[1] if _REG_CACHE is not None and _REG_CACHE[0] == key else REGISTRY_PATH.read_bytes()
+        unchanged = on_disk == data
+    if not unchanged:
+        # write a sibling then rename: readers never see a half-written registry
+        tmp = REGISTRY_PATH.with_suffix(f".json.{os.getpid()}.tmp")
+        with open(tmp, "wb") as f:
+            f.write(data)
+            f.flush()
+            # key off our own file: the rename keeps inode, size and mtime, while a
+            # stat() of the path afterwards could see another process's save
+            key = _registry_key(os.fstat(f.fileno()))
+        os.replace(tmp, REGISTRY_PATH)
+    _REG_CACHE = (key, data)
+    if unchanged:
+        print(f"[dim]Registry unchanged[/] → {REGISTRY_PATH}")
+    else:
+        print(f"[green]Updated registry[/] → {REGISTRY_PATH}")
 
 def guess_output_dir(repo_dir: Path) -> Path:
     for name in ("dist", "build", "public"):
@@ -281,67 +447,267 @@ def guess_output_dir(repo_dir: Path) -> Path:
             return p
     return repo_dir  # fallback
 
+def _copy_fds(fsrc: int, fdst: int):
+    """Copy fsrc into fdst in-kernel: copy_file_range (reflinks on CoW filesystems), else sendfile."""
+    global _COPY_FILE_RANGE
+    size = os.fstat(fsrc).st_size
+    done = 0
+    if _COPY_FILE_RANGE:
+        try:
+            while done < size:
+                n = os.copy_file_range(fsrc, fdst, size - done)
+                if n == 0:
+                    return
+                done += n
+            return
+        except OSError:
+            # e.g. EXDEV/ENOSYS on older kernels: only recoverable before any bytes moved
+            if done:
+                raise
+            _COPY_FILE_RANGE = False  # same failure would repeat for every file; go straight to sendfile
+    # sendfile with an explicit offset: no userspace buffer, no file-position seeks
+    while done < size:
+        n = os.sendfile(fdst, fsrc, done, size - done)
+        if n == 0:
+            return
+        done += n
+
+def _scan_copy(ex: ThreadPoolExecutor, max_pending: int, src: str, dst: str, ignore: frozenset) -> list:
+    """
+    Copy src into the (empty) dst dir by scandir-ing directory fds: files are opened
+    relative to their dir fds, so paths are resolved once per directory, not per file.
+    Ignored names are dropped before any is_dir()/open, so e.g. .git is never entered.
+    Returns the pending copy futures.
+    """
+    futures = []
+    slots = threading.BoundedSemaphore(max_pending)  # caps fds held by queued copies
+
+    def copy(fsrc: int, fdst: int):
+        try:
+            _copy_fds(fsrc, fdst)
+        finally:
+            os.close(fsrc)
+            os.close(fdst)
+            slots.release()
+
+    def walk(src_dirfd: int, dst_dirfd: int):
+        with os.scandir(src_dirfd) as it:
+            entries = [e for e in it]
+        for entry in entries:
+            name = entry.name
+            if name in ignore:
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                os.mkdir(name, dir_fd=dst_dirfd)
+                sub_src = os.open(name, os.O_RDONLY | os.O_DIRECTORY | os.O_NOFOLLOW, dir_fd=src_dirfd)
+                try:
+                    sub_dst = os.open(name, os.O_RDONLY | os.O_DIRECTORY, dir_fd=dst_dirfd)
+                    try:
+                        walk(sub_src, sub_dst)
+                    finally:
+                        os.close(sub_dst)
+                finally:
+                    os.close(sub_src)
+            # regular files and links to them; symlinked dirs, dangling links and
+            # FIFOs/sockets/devices are skipped (open() on a FIFO blocks forever)
+            elif entry.is_file():
+                slots.acquire()
+                try:
+                    fsrc = os.open(name, os.O_RDONLY, dir_fd=src_dirfd)
+                    try:
+                        fdst = os.open(name, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644, dir_fd=dst_dirfd)
+                    except BaseException:
+                        os.close(fsrc)
+                        raise
+                except BaseException:
+                    slots.release()
+                    raise
+                futures.append(ex.submit(copy, fsrc, fdst))
+
+    src_root = os.open(src, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        dst_root = os.open(dst, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            walk(src_root, dst_root)
+        finally:
+            os.close(dst_root)
+    finally:
+        os.close(src_root)
+    return futures
+
+def _fast_rmtree(path: str):
+    """Post-order delete; scandir's cached d_type spares an lstat per entry."""
+    if os.path.islink(path):
+        os.unlink(path)  # drop the link itself, never the tree it points at
+        return
+    with os.scandir(path) as it:
+        entries = [e for e in it]  # finish reading the dir before unlinking from it
+    for entry in entries:
+        if entry.is_dir(follow_symlinks=False):
+            _fast_rmtree(entry.path)
+        else:
+            os.unlink(entry.path)
+    os.rmdir(path)
+
+def tree_fingerprint(root: Path, ignore: frozenset) -> str:
+    """Cheap change detector for a tree: hash of sorted (relpath, size, mtime) per file, plus other links' targets."""
+    rows = []
+    def scan(path: str, rel: str):
+        with os.scandir(path) as it:
+            for entry in it:
+                if entry.name in ignore:
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    scan(entry.path, rel + entry.name + "/")
+                elif entry.is_file():  # same set _scan_copy copies; stat() can't hit a dangling link
+                    st = entry.stat()
+                    rows.append(f"{rel}{entry.name}\0{st.st_size}\0{st.st_mtime_ns}\n")
+                elif entry.is_symlink():
+                    # dir or dangling links: rsync keeps in-tree ones as links, so a retarget counts
+                    rows.append(f"{rel}{entry.name}\0->{os.readlink(entry.path)}\n")
+    scan(str(root), "")
+    h = hashlib.blake2b(digest_size=16)
+    for row in sorted(rows):
+        h.update(row.encode("utf-8", "surrogateescape"))
+    return h.hexdigest()
+
+def _copytree_ignore(root: str, names: list) -> set:
+    """copytree ignore hook matching _scan_copy: cruft, symlinked dirs and special files."""
+    skip = set(STATIC_IGNORE.intersection(names))
+    for name in names:
+        if name in skip:
+            continue
+        path = os.path.join(root, name)
+        # one lstat classifies the entry; only links pay a second stat, for their target
+        mode = os.lstat(path).st_mode
+        if stat.S_ISLNK(mode):
+            try:
+                mode = os.stat(path).st_mode
+            except FileNotFoundError:
+                mode = 0  # dangling
+            if not stat.S_ISREG(mode):  # links are copied only as the files they point at
+                skip.add(name)
+        elif not (stat.S_ISREG(mode) or stat.S_ISDIR(mode)):  # FIFO, socket, device
+            skip.add(name)
+    return skip
+
 def copy_static(src: Path, dst: Path):
+    # Incremental sync: only changed files are rewritten, --delete drops stale ones
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    if os.path.islink(dst):
+        os.unlink(dst)  # rsync --delete would sync (and prune) the link's target
+    try:
+        # like the fallbacks, never pull in trees outside src: --safe-links drops links
+        # pointing out of it, --no-D skips FIFOs/sockets/devices
+        run(["rsync", "-a", "--no-D", "--delete", "--safe-links",
+             *[f"--exclude={name}" for name in sorted(STATIC_IGNORE)],
+             f"{src}/", f"{dst}/"])
+        return
+    except FileNotFoundError:
+        print("[yellow]rsync not found[/] → falling back to full copy")
+
     if dst.exists():
-        shutil.rmtree(dst)
+        _fast_rmtree(str(dst))
     dst.mkdir(parents=True, exist_ok=True)
-    # copytree-like: copy all files/dirs except obvious config cruft
-    ignore = {".git", ".github", "node_modules", ".DS_Store", "vibe.yaml"}
-    for root, dirs, files in os.walk(src):
-        rpath = Path(root)
-        # prune ignored dirs
-        dirs[:] = [d for d in dirs if d not in ignore]
-        rel = rpath.relative_to(src)
-        (dst / rel).mkdir(parents=True, exist_ok=True)
-        for f in files:
-            if f in ignore:
-                continue
-            shutil.copy2(rpath / f, dst / rel / f)
+    # copytree-like: copy all files/dirs except obvious config cruft.
+    # The walk creates directories up front; the I/O-bound file copies overlap.
+    workers = min(32, (os.cpu_count() or 4) * 4)
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        if _FD_COPY:
+            futures = _scan_copy(ex, workers * 4, str(src), str(dst), STATIC_IGNORE)
+        else:
+            # copytree drives the walk and creates dirs; the file copies go to the pool
+            futures = []
+            shutil.copytree(src, dst, dirs_exist_ok=True, ignore=_copytree_ignore,
+                            copy_function=lambda s, d: futures.append(ex.submit(shutil.copy, s, d)))
+        for f in futures:
+            f.result()
+
+@lru_cache(maxsize=128)
+def _parse_yaml_cached(path: str, mtime_ns: int) -> dict:
+    # mtime_ns is only part of the cache key: an edited file gets re-parsed
+    with open(path) as f:
+        return yaml.load(f, Loader=_YamlLoader) or {}
 
 def parse_vibe_yaml(repo_dir: Path) -> dict:
+    """Parsed vibe.yaml (shared, cached per mtime: treat as read-only)."""
     f = repo_dir / "vibe.yaml"
-    if f.exists():
-        return yaml.safe_load(f.read_text()) or {}
-    return {}
+    try:
+        st = f.stat()
+    except FileNotFoundError:
+        return {}
+    return _parse_yaml_cached(str(f), st.st_mtime_ns)
 
 @app.command()
-def deploy(repo: str, app_id: Optional[str] = typer.Option(None, help="Override app id")):
+def deploy(
+    repo: str,
+    app_id: Optional[str] = typer.Option(None, help="Override app id"),
+    sha: Optional[str] = typer.Option(None, help="Commit SHA to deploy (fetched if not checked out); skips the remote check"),
+    force: bool = typer.Option(False, "--force", help="Rebuild and recopy even if nothing changed"),
+):
     """
     Deploy an app:
       - static/spa: (optional) build + copy to /srv/vibes/static/<id>/
       - server: generate compose + up (no static copy)
     """
-    VIBES_ROOT.mkdir(parents=True, exist_ok=True)
-    STATIC_ROOT.mkdir(parents=True, exist_ok=True)
-    APPS_ROOT.mkdir(parents=True, exist_ok=True)
+    _ensure_roots()
 
     # 1) clone or pull
     repo_url = repo[:-1] if repo.endswith("/") else repo
-    inferred = slugify(Path(repo_url).stem)
-    app_id = slugify(app_id or inferred)
+    # slugified once here (or once from vibe.yaml below); helpers take the slug as-is
+    app_id = slugify(app_id or Path(repo_url).stem)
     work_dir = APPS_ROOT / app_id
     repo_dir = work_dir / "repo"
 
-    if repo_dir.exists():
-        print(f"[yellow]Repo exists[/] → pulling latest in {repo_dir}")
-        run(["git", "-C", str(repo_dir), "pull", "--ff-only"])
+    # shallow + blob-filtered: deploys only need the tip commit's tree
+    current = False  # checkout already at the wanted commit, nothing fetched
+    fingerprint = None  # of the static output, when one was built this run
+    if os.path.isdir(repo_dir):
+        # cheap remote inspection first: no fetch/build/copy if HEAD hasn't moved
+        local = git_head(repo_dir)
+        if sha:
+            current = local == sha  # pinned commit: no remote check needed
+        else:
+            current = local is not None and git_remote_head(repo_url) == local
+        if current:
+            print(f"[green]Repo up to date[/] at {local[:12]}")
+        else:
+            print(f"[yellow]Repo exists[/] → fetching {sha or 'latest'} in {repo_dir}")
+            run(["git", "-C", str(repo_dir), "fetch", "--depth=1", "origin", sha or "HEAD"])
+            run(["git", "-C", str(repo_dir), "reset", "--hard", "FETCH_HEAD"])
+            local = git_head(repo_dir)
     else:
         work_dir.mkdir(parents=True, exist_ok=True)
-        run(["git", "clone", repo_url, str(repo_dir)])
+        run(["git", "clone", "--depth=1", "--single-branch", "--filter=blob:none", repo_url, str(repo_dir)])
+        local = git_head(repo_dir)
+        if sha and local != sha:
+            run(["git", "-C", str(repo_dir), "fetch", "--depth=1", "origin", sha])
+            run(["git", "-C", str(repo_dir), "reset", "--hard", "FETCH_HEAD"])
+            local = git_head(repo_dir)
+    if sha and local != sha:
+        print(f"[red]Checked out {local}, expected {sha}[/]")
+        raise typer.Exit(code=2)
 
     # 2) load config with safe defaults (no vibe.yaml => static)
     cfg = parse_vibe_yaml(repo_dir) or {}
     if "id" in cfg:
         app_id = slugify(cfg["id"]) or app_id  # allow override but keep fallback
 
+    # only skip the build if this exact commit is what was last deployed under the final id
+    unchanged = (current and not force
+                 and load_registry()["apps"].get(app_id, {}).get("sha") == local)
+
     app_type = (cfg.get("type") or "static").lower()
     if app_type in ("static", "spa"):
         build_cfg = cfg.get("build") if isinstance(cfg.get("build"), dict) else {}
     else:
         build_cfg = {}  # irrelevant for server
 
+    if app_type in ("static", "spa") and unchanged and os.path.isdir(STATIC_ROOT / app_id):
+        print(f"[green]No upstream changes[/] → skipping build/copy for {app_id}")
+
     # --- STATIC/SPA PATH ---
-    if app_type in ("static", "spa"):
+    elif app_type in ("static", "spa"):
         install_cmd = build_cfg.get("install")
         build_cmd   = build_cfg.get("command")
         base_path_env = build_cfg.get("base_path_env")
@@ -353,18 +719,11 @@ def deploy(repo: str, app_id: Optional[str] = typer.Option(None, help="Override
             env[base_path_env] = f"/app/{app_id}/"
             print(f"[blue]Set {base_path_env}={env[base_path_env]}[/]")
 
-        # extra build envs (shell + env_file)
-        for name in (build_cfg.get("env") or []):
-            if name in os.environ:
-                env[name] = os.environ[name]
+        # extra build envs: build.env names need no copying (env already holds
+        # the whole shell environment), so only the env_file adds anything
         env_file = build_cfg.get("env_file")
         if env_file and Path(env_file).exists():
-            for line in Path(env_file).read_text().splitlines():
-                line = line.strip()
-                if not line or line.startswith("#") or "=" not in line:
-                    continue
-                k, v = line.split("=", 1)
-                env[k.strip()] = v.strip()
+            env.update(_parse_dotenv(Path(env_file)))
             print(f"[green]Loaded build env from[/] {env_file}")
 
         # optional build; if no commands, we just copy guessed output dir
@@ -390,8 +749,12 @@ def deploy(repo: str, app_id: Optional[str] = typer.Option(None, help="Override
             raise typer.Exit(code=2)
 
         dest = STATIC_ROOT / app_id
-        print(f"[green]Copying static files[/] {output_dir} → {dest}")
-        copy_static(output_dir, dest)
+        fingerprint = tree_fingerprint(output_dir, STATIC_IGNORE)
+        if not force and os.path.isdir(dest) and load_registry()["apps"].get(app_id, {}).get("fingerprint") == fingerprint:
+            print(f"[green]Build output unchanged[/] → skipping copy to {dest}")
+        else:
+            print(f"[green]Copying static files[/] {output_dir} → {dest}")
+            copy_static(output_dir, dest)
 
     # --- SERVER PATH ---
     elif app_type == "server":
@@ -423,8 +786,11 @@ def deploy(repo: str, app_id: Optional[str] = typer.Option(None, help="Override
         },
         "created_at": created,
         "updated_at": now,
+        "sha": local,
         "meta": cfg.get("meta") or {}
     })
+    if fingerprint:
+        entry["fingerprint"] = fingerprint
     reg["apps"][app_id] = entry
     save_registry(reg)
 
@@ -471,17 +837,19 @@ def undeploy(
             print("[yellow]Aborted.[/]")
             raise typer.Exit(code=1)
 
-    # 1) bring down any compose stack
-    try:
-        compose_down_if_present(sid)
-    except subprocess.CalledProcessError as e:
-        print(f"[red]compose down failed[/]: {e}")
-
-    # 2) remove static files
-    if safe_rmtree(static_dir):
-        print(f"[green]Removed[/] {static_dir}")
-    else:
-        print(f"[yellow]Static dir not found[/]: {static_dir}")
+    # 1+2) bring down any compose stack and remove static files;
+    #      independent and I/O bound, so overlap the Docker round trip with the delete
+    with ThreadPoolExecutor(max_workers=2) as ex:
+        down = ex.submit(compose_down_if_present, sid)
+        removed = ex.submit(safe_rmtree, static_dir)
+        try:
+            down.result()
+        except subprocess.CalledProcessError as e:
+            print(f"[red]compose down failed[/]: {e}")
+        if removed.result():
+            print(f"[green]Removed[/] {static_dir}")
+        else:
+            print(f"[yellow]Static dir not found[/]: {static_dir}")
 
     # 3) remove blog stub if present (optional)
     if blog_md.exists():
@@ -506,14 +874,23 @@ def undeploy(
     print(f"\n[bold green]Undeployed '{sid}'.[/]")
 
 
+def _row_for_app(item: tuple[str, dict]) -> tuple[str, ...]:
+    """One `list` table row; per-app lookups (e.g. container status) belong here."""
+    aid, e = item
+    return (aid, e.get("type","?"), e["links"]["app"], e.get("repo",""))
+
 @app.command()
 def list():
     """List registered apps."""
     reg = load_registry()
     t = Table(title="Vibe Apps")
-    t.add_column("ID"); t.add_column("Type"); t.add_column("App URL"); t.add_column("Repo")
-    for aid, e in sorted(reg["apps"].items()):
-        t.add_row(aid, e.get("type","?"), e["links"]["app"], e.get("repo",""))
+    t.add_column("ID"); t.add_column("Type"); t.add_column("App URL", no_wrap=True); t.add_column("Repo")
+    apps = reg["apps"]
+    # rows are built on a pool so I/O-bound per-app columns run concurrently;
+    # ex.map keeps the sorted order
+    with ThreadPoolExecutor(max_workers=min(32, len(apps) or 1)) as ex:
+        for row in ex.map(_row_for_app, ((aid, apps[aid]) for aid in sorted(apps))):
+            t.add_row(*row)
     print(t)
 
 if __name__ == "__main__":